@@ -1,3 +1,4 @@
 from .affinity_v2 import AffinityClientV2
 from .affinity_v1 import AffinityClientV1
-from .postgres import PostgresClient, Table as PostgresTable
+from .affinity_v1_async import AffinityClientV1Async
+from .postgres import EntitlementBuffer, PostgresClient, Table as PostgresTable
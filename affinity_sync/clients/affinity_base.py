@@ -1,10 +1,20 @@
+import functools
 import logging
-from typing import Type, get_origin, TypeVar, Any, Union
+import random
+import threading
+import time
+from typing import Generator, Type, get_origin, TypeVar, Any, Union
 
-import backoff
+import orjson
 import requests
 
-from ..module_types import base, affinity_v2_api as affinity_types
+try:
+    import ijson
+
+except ImportError:
+    ijson = None
+
+from ..module_types import base, affinity_v1_structs, affinity_v2_api as affinity_types
 
 T = TypeVar('T', base.Base, list[base.Base])
 
@@ -13,37 +23,142 @@ class TryAgainError(Exception):
     pass
 
 
+# Process-wide ceiling on in-flight Affinity requests, shared by every client so
+# concurrent Writers cooperate instead of stacking up against the API's rate limit.
+_MAX_CONCURRENT_REQUESTS = 10
+_request_slots = threading.BoundedSemaphore(_MAX_CONCURRENT_REQUESTS)
+
+_RATE_LIMIT_HEADERS = (
+    ('user_limit', 'X-Ratelimit-Limit-User'),
+    ('user_remaining', 'X-Ratelimit-Limit-User-Remaining'),
+    ('user_reset', 'X-Ratelimit-Limit-User-Reset'),
+    ('org_limit', 'X-Ratelimit-Limit-Org'),
+    ('org_remaining', 'X-Ratelimit-Limit-Org-Remaining'),
+    ('org_reset', 'X-Ratelimit-Limit-Org-Reset'),
+)
+
+
+def parse_rate_limit(headers) -> affinity_types.ApiCallEntitlement | None:
+    try:
+        raw = {field: headers[header] for field, header in _RATE_LIMIT_HEADERS}
+
+    except KeyError:
+        return None
+
+    return affinity_types.ApiCallEntitlement.model_construct(**{
+        field: 9_999_999 if value == 'unlimited' else int(value)
+        for field, value in raw.items()
+    })
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_result_type(result_type) -> tuple[str, Any]:
+    origin = get_origin(result_type)
+
+    if origin is list:
+        return 'list', result_type.__args__[0]
+
+    if origin is Union:
+        return 'union', result_type.__args__
+
+    return 'scalar', result_type
+
+
+@functools.lru_cache(maxsize=64)
+def _trusted_constructor(model_type) -> Any | None:
+    # Only models that define their own from_trusted (to handle aliases or nested
+    # models by hand, e.g. Company's 'global' alias) skip validation at scalar call
+    # sites; everything else keeps model_validate.
+    if 'from_trusted' in model_type.__dict__:
+        return model_type.from_trusted
+
+    return None
+
+
+@functools.lru_cache(maxsize=16)
+def _struct_decoder(inner_type) -> Any | None:
+    mirror = affinity_v1_structs.STRUCT_MIRRORS.get(inner_type)
+
+    if mirror is None:
+        return None
+
+    return affinity_v1_structs.msgspec.json.Decoder(list[mirror])
+
+
 class AffinityBase:
     __URL = 'https://api.affinity.co/v2/'
 
-    def __init__(self, api_key: str):
+    # List responses come straight from the Affinity API, so by default they are built via
+    # model_construct and skip the pydantic validation pass. Flip this on to get strict
+    # validation back (e.g. in tests). Inputs (NewPerson etc.) are always validated.
+    VALIDATE_RESPONSES = False
+
+    __THROTTLE_STEP = 0.05
+    __MAX_THROTTLE_DELAY = 30.0
+    __MAX_RATE_LIMIT_PAUSE = 60.0
+    __MAX_TRIES = 3
+    __BACKOFF_BASE = 1.0
+    __BACKOFF_JITTER = 1.0
+
+    def __init__(self, api_key: str, pool_maxsize: int = 32):
         self.__session = requests.Session()
-        self.__session.headers.update({'Authorization': f'Bearer {api_key}'})
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.__session.mount('https://', adapter)
+        self.__session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip'
+        })
         self.__logger = logging.getLogger('affinity_sync.AffinityBaseClient')
         self.__api_key = api_key
+        self.__throttle_delay = 0.0
         self.api_call_entitlement: affinity_types.ApiCallEntitlement | None = None
 
+    def close(self) -> None:
+        """Release the pooled connections held by this client."""
+        self.__session.close()
+
+    def __enter__(self) -> 'AffinityBase':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def __extract_rate_limit(self, response: requests.Response):
-        if not all(
-                key in response.headers
-                for key in [
-                    'X-Ratelimit-Limit-User',
-                    'X-Ratelimit-Limit-User-Remaining',
-                    'X-Ratelimit-Limit-User-Reset',
-                    'X-Ratelimit-Limit-Org',
-                    'X-Ratelimit-Limit-Org-Remaining',
-                    'X-Ratelimit-Limit-Org-Reset',
-                ]
-        ):
-            raise ValueError('Rate limit headers not found in response')
-
-        self.api_call_entitlement = affinity_types.ApiCallEntitlement.model_validate(response.headers)
-
-    @backoff.on_exception(
-        backoff.expo,
-        (requests.exceptions.ConnectionError, TryAgainError),
-        max_tries=3
-    )
+        entitlement = parse_rate_limit(response.headers)
+
+        if entitlement is None:
+            self.__logger.debug('Rate limit headers not found in response - skipping')
+            return
+
+        self.api_call_entitlement = entitlement
+
+    def __throttle(self):
+        if self.__throttle_delay:
+            time.sleep(self.__throttle_delay)
+
+        entitlement = self.api_call_entitlement
+
+        if entitlement and entitlement.user_remaining < entitlement.user_limit * 0.1:
+            self.__logger.info(
+                f'Only {entitlement.user_remaining} calls remaining this minute'
+                f' - pausing for {entitlement.user_reset} seconds'
+            )
+            time.sleep(min(entitlement.user_reset, self.__MAX_RATE_LIMIT_PAUSE))
+
+    def __increase_throttle(self):
+        self.__throttle_delay = min(
+            max(self.__throttle_delay * 2, self.__THROTTLE_STEP),
+            self.__MAX_THROTTLE_DELAY
+        )
+
+    def __reduce_throttle(self):
+        self.__throttle_delay = max(0.0, self.__throttle_delay - self.__THROTTLE_STEP)
+
     def _send_request(
             self,
             method: str,
@@ -51,40 +166,97 @@ class AffinityBase:
             result_type: Type[T],
             params: dict | None = None,
             json: dict | None = None,
+            json_model: base.Base | None = None,
             files: Any | None = None
     ) -> T:
 
-        if files and json:
+        if files and (json or json_model):
             raise ValueError('Cannot send both data and json in a request')
 
+        if json is not None and json_model is not None:
+            raise ValueError('Cannot send both json and json_model in a request')
+
+        last_error = None
+
+        for attempt in range(self.__MAX_TRIES):
+            try:
+                return self.__send_request_once(
+                    method=method,
+                    url=url,
+                    result_type=result_type,
+                    params=params,
+                    json=json,
+                    json_model=json_model,
+                    files=files
+                )
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, TryAgainError) as e:
+                last_error = e
+                self.__logger.debug(f'Request failed ({e.__class__.__name__}) - attempt {attempt + 1}')
+
+                if attempt + 1 < self.__MAX_TRIES:
+                    time.sleep(self.__BACKOFF_BASE * 2 ** attempt + random.random() * self.__BACKOFF_JITTER)
+
+        raise last_error
+
+    def __send_request_once(
+            self,
+            method: str,
+            url: str,
+            result_type: Type[T],
+            params: dict | None = None,
+            json: dict | None = None,
+            json_model: base.Base | None = None,
+            files: Any | None = None
+    ) -> T:
         self.__logger.debug(f'Sending {method.upper()} request to {url}')
-        response = self.__session.request(
-            method=method,
-            url=url,
-            params=params,
-            json=json,
-            files=files,
-            **({'auth': ('username', self.__api_key)} if 'v2' not in url else {})
-        )
 
-        if response.status_code == 422:
-            raise TryAgainError()
+        if json is not None:
+            body = orjson.dumps(json)
 
-        response.raise_for_status()
-        self.__extract_rate_limit(response)
+        elif json_model is not None:
+            body = orjson.dumps(json_model, default=lambda model: model.model_dump())
+
+        else:
+            body = None
+
+        self.__throttle()
+
+        with _request_slots:
+            response = self.__session.request(
+                method=method,
+                url=url,
+                params=params,
+                data=body,
+                headers={'Content-Type': 'application/json'} if body is not None else None,
+                files=files,
+                **({'auth': ('username', self.__api_key)} if 'v2' not in url else {})
+            )
+
+        self.__check_response(response)
+        kind, inner = _resolve_result_type(result_type)
 
-        if get_origin(result_type) is list:
-            inner_type = result_type.__args__[0]
+        if kind == 'list':
 
-            return [inner_type.model_validate(item) for item in response.json()]
+            if self.VALIDATE_RESPONSES:
+                return [inner.model_validate(item) for item in orjson.loads(response.content)]
 
-        if get_origin(result_type) is Union:
-            inner_types = result_type.__args__
+            decoder = _struct_decoder(inner)
+
+            if decoder is not None:
+                return decoder.decode(response.content)
+
+            return [inner.from_trusted(item) for item in orjson.loads(response.content)]
+
+        data = orjson.loads(response.content)
+
+        if kind == 'union':
+            inner_types = inner
             errors = []
 
             for inner_type in inner_types:
                 try:
-                    return inner_type.model_validate(response.json())
+                    return inner_type.model_validate(data)
                 except Exception as e:
                     errors.append(e)
                     continue
@@ -94,4 +266,99 @@ class AffinityBase:
 
             raise errors[0]
 
-        return result_type.model_validate(response.json())
+        constructor = None if self.VALIDATE_RESPONSES else _trusted_constructor(result_type)
+
+        if constructor is not None:
+            return constructor(data)
+
+        return result_type.model_validate(data)
+
+    def __check_response(self, response: requests.Response) -> None:
+        """Shared status handling - throttle bookkeeping plus TryAgainError on 422/429/503."""
+
+        if response.status_code == 422:
+            raise TryAgainError()
+
+        if response.status_code in (429, 503):
+            self.__increase_throttle()
+            self.__extract_rate_limit(response)
+            reset = self.api_call_entitlement.user_reset if self.api_call_entitlement else 0
+            wait = min(
+                max(float(response.headers.get('Retry-After') or 0), reset, 1),
+                self.__MAX_RATE_LIMIT_PAUSE
+            )
+            self.__logger.warning(
+                f'Got {response.status_code} - waiting {wait} seconds before retrying'
+            )
+            time.sleep(wait)
+            raise TryAgainError()
+
+        if response.status_code >= 500:
+            self.__increase_throttle()
+
+        response.raise_for_status()
+        self.__reduce_throttle()
+        self.__extract_rate_limit(response)
+
+    def __open_stream_once(
+            self,
+            method: str,
+            url: str,
+            params: dict | None
+    ) -> requests.Response:
+        self.__throttle()
+
+        with _request_slots:
+            response = self.__session.request(
+                method=method,
+                url=url,
+                params=params,
+                stream=True,
+                **({'auth': ('username', self.__api_key)} if 'v2' not in url else {})
+            )
+
+        self.__check_response(response)
+
+        return response
+
+    def _iter_request(
+            self,
+            method: str,
+            url: str,
+            item_type: Type[base.BaseSubclass],
+            params: dict | None = None
+    ) -> Generator[base.BaseSubclass, None, None]:
+        """
+        Stream a list response, yielding each item as it parses instead of materialising
+        the whole body. Falls back to a single full-body parse when ijson is not installed.
+        The send and status handling happen before the first yield, so they retry and
+        back off exactly like _send_request.
+        """
+        self.__logger.debug(f'Streaming {method.upper()} request to {url}')
+        last_error = None
+
+        for attempt in range(self.__MAX_TRIES):
+            try:
+                response = self.__open_stream_once(method=method, url=url, params=params)
+                break
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, TryAgainError) as e:
+                last_error = e
+                self.__logger.debug(f'Request failed ({e.__class__.__name__}) - attempt {attempt + 1}')
+
+                if attempt + 1 < self.__MAX_TRIES:
+                    time.sleep(self.__BACKOFF_BASE * 2 ** attempt + random.random() * self.__BACKOFF_JITTER)
+
+        else:
+            raise last_error
+
+        if ijson is not None:
+            response.raw.decode_content = True
+
+            for item in ijson.items(response.raw, 'item'):
+                yield item_type.from_trusted(item)
+
+            return
+
+        for item in orjson.loads(response.content):
+            yield item_type.from_trusted(item)
@@ -1,32 +1,145 @@
+import concurrent.futures
 import datetime
 import logging
-from typing import Literal, Union
+import threading
+import time
+from typing import Any, Callable, Generator, Literal, Union
 
 import requests
 
 from . import affinity_base
 from ..module_types import affinity_v1_api as affinity_types
 
+_CACHE_MISS = object()
+
+_ENTITY_PARAM = {
+    'person': 'person_id',
+    'company': 'organization_id',
+    'opportunity': 'opportunity_id',
+}
+
 
 class AffinityClientV1(affinity_base.AffinityBase):
     __URL = 'https://api.affinity.co/'
+    __MAX_LOOKUP_WORKERS = 8
+    __FINDER_CACHE_TTL = 60
+    __FINDER_CACHE_MAX_SIZE = 4096
+    __FIELDS_TTL = 3600
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, pool_maxsize: int = 32):
         self.__logger = logging.getLogger('affinity_sync.AffinityClientV1')
-        super().__init__(api_key)
+        self.__lookup_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self.__executor_lock = threading.Lock()
+        self.__finder_cache: dict[tuple, tuple[float, Any]] = {}
+        self.__fields_cache: list[affinity_types.Field] | None = None
+        self.__fields_cached_at = 0.0
+        self.__url_persons = self.__URL + 'persons'
+        self.__url_organizations = self.__URL + 'organizations'
+        self.__url_opportunities = self.__URL + 'opportunities'
+        self.__url_fields = self.__URL + 'fields'
+        self.__url_field_values = self.__URL + 'field-values'
+        super().__init__(api_key, pool_maxsize=pool_maxsize)
+
+    def __cache_get(self, key: tuple) -> Any:
+        entry = self.__finder_cache.get(key)
+
+        if entry is None:
+            return _CACHE_MISS
+
+        expires_at, value = entry
+
+        if time.monotonic() > expires_at:
+            # pop rather than del - concurrent finders can race on the same expired key.
+            self.__finder_cache.pop(key, None)
+            return _CACHE_MISS
+
+        return value
+
+    def __cache_set(self, key: tuple, value: Any) -> None:
+        if len(self.__finder_cache) >= self.__FINDER_CACHE_MAX_SIZE:
+            self.__finder_cache.clear()
+
+        self.__finder_cache[key] = (time.monotonic() + self.__FINDER_CACHE_TTL, value)
 
     def __url(self, path: str) -> str:
         return f'{self.__URL}{path}'
 
+    def __refresh_person_cache(self, person: affinity_types.Person) -> None:
+        """
+        Keep the finder cache coherent after a write - a cached miss must not outlive
+        the person it now matches, or find-or-create flows would create duplicates.
+        Email keys are seeded with the written person; name keys are dropped so the
+        next lookup re-queries (a name may legitimately match several people).
+        """
+        for email in person.emails:
+            self.__cache_set(('person_by_email', email.strip().lower()), person)
+
+        for take_best_match in (False, True):
+            self.__finder_cache.pop(
+                ('person_by_name', person.first_name.strip().lower(), person.last_name.strip().lower(),
+                 take_best_match),
+                None
+            )
+
+    def __refresh_company_cache(self, company: affinity_types.Company) -> None:
+        """See __refresh_person_cache - same coherence rules for company lookups."""
+        domains = {domain.strip().lower() for domain in [company.domain, *company.domains] if domain}
+
+        for domain in domains:
+            for take_best_match in (False, True):
+                self.__cache_set(('company_by_domain', domain, take_best_match), company)
+
+        for take_best_match in (False, True):
+            self.__finder_cache.pop(('company_by_name', company.name.strip().lower(), take_best_match), None)
+
+    def __executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self.__lookup_executor is None:
+            with self.__executor_lock:
+                if self.__lookup_executor is None:
+                    self.__lookup_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.__MAX_LOOKUP_WORKERS
+                    )
+
+        return self.__lookup_executor
+
+    def close(self) -> None:
+        """Shut down the lookup executor as well as the pooled session."""
+
+        if self.__lookup_executor is not None:
+            self.__lookup_executor.shutdown(wait=False)
+
+        super().close()
+
+    def __first_concurrent_match(
+            self,
+            find: Callable[[str], Any],
+            values: list[str]
+    ) -> Any | None:
+        futures = [self.__executor().submit(find, value) for value in values]
+
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+
+                if result:
+                    return result
+
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return None
+
     def create_person(self, new_person: affinity_types.NewPerson) -> affinity_types.Person:
         self.__logger.info(f'Creating person - {new_person.first_name} {new_person.last_name}')
+        new_person.emails = affinity_types.clean_emails(new_person.emails)
 
         try:
-            return self._send_request(
+            person = self._send_request(
                 method='post',
-                url=self.__url('persons'),
+                url=self.__url_persons,
                 result_type=affinity_types.Person,
-                json=new_person.model_dump()
+                json_model=new_person
             )
 
         except requests.exceptions.HTTPError as e:
@@ -38,30 +151,37 @@ class AffinityClientV1(affinity_base.AffinityBase):
 
             raise e
 
+        self.__refresh_person_cache(person)
+
+        return person
+
     def find_person_by_email(self, email: str) -> affinity_types.Person | None:
+        email = email.strip().lower()
         self.__logger.debug(f'Finding person by email - {email}')
+        cache_key = ('person_by_email', email)
+        cached = self.__cache_get(cache_key)
+
+        if cached is not _CACHE_MISS:
+            return cached
+
         response = self._send_request(
             method='get',
-            url=self.__url(f'persons'),
+            url=self.__url_persons,
             result_type=affinity_types.PersonQueryResponse,
-            params={'term': email}
+            params={'term': email, 'page_size': 1}
         )
+        person = response.persons[0] if response.persons else None
+        self.__cache_set(cache_key, person)
 
-        if response.persons:
-            return response.persons[0]
-
-        return None
+        return person
 
     def find_person_by_emails(self, emails: list[str]) -> affinity_types.Person | None:
         self.__logger.debug(f'Finding person by emails - {emails}')
 
-        for email in emails:
-            person = self.find_person_by_email(email=email)
+        if len(emails) == 1:
+            return self.find_person_by_email(email=emails[0])
 
-            if person:
-                return person
-
-        return None
+        return self.__first_concurrent_match(find=self.find_person_by_email, values=emails)
 
     def find_person_by_name(
             self,
@@ -69,38 +189,62 @@ class AffinityClientV1(affinity_base.AffinityBase):
             last_name: str,
             take_best_match: bool = False
     ) -> affinity_types.Person | None:
+        first_name = first_name.strip()
+        last_name = last_name.strip()
         self.__logger.debug(f'Finding person by name - {first_name} {last_name}')
+        cache_key = ('person_by_name', first_name.lower(), last_name.lower(), take_best_match)
+        cached = self.__cache_get(cache_key)
+
+        if cached is not _CACHE_MISS:
+            return cached
+
         response = self._send_request(
             method='get',
-            url=self.__url(f'persons'),
+            url=self.__url_persons,
             result_type=affinity_types.PersonQueryResponse,
             params={'term': f'{first_name} {last_name}'}
         )
 
+        first_name_upper = first_name.upper()
+        last_name_upper = last_name.upper()
         valid_persons = [
             person
             for person in response.persons
-            if person.first_name.upper() == first_name.upper() and person.last_name.upper() == last_name.upper()
+            if person.first_name.upper() == first_name_upper and person.last_name.upper() == last_name_upper
         ]
 
         if len(valid_persons) == 1:
-            return response.persons[0]
+            self.__cache_set(cache_key, valid_persons[0])
+            return valid_persons[0]
 
         if len(valid_persons) > 1 and take_best_match:
+            self.__cache_set(cache_key, valid_persons[0])
             return valid_persons[0]
 
         if len(valid_persons) > 1:
             raise affinity_types.MultipleResults(f'Multiple results found for {first_name} {last_name}')
 
+        self.__cache_set(cache_key, None)
+
         return None
 
     def fetch_fields(self) -> list[affinity_types.Field]:
+
+        if self.__fields_cache is not None and time.monotonic() - self.__fields_cached_at < self.__FIELDS_TTL:
+            return self.__fields_cache
+
         self.__logger.debug('Fetching fields')
-        return self._send_request(
+        self.__fields_cache = self._send_request(
             method='get',
-            url=self.__url('fields'),
+            url=self.__url_fields,
             result_type=list[affinity_types.Field]
         )
+        self.__fields_cached_at = time.monotonic()
+
+        return self.__fields_cache
+
+    def invalidate_fields(self) -> None:
+        self.__fields_cache = None
 
     def fetch_field_values(
             self,
@@ -113,13 +257,12 @@ class AffinityClientV1(affinity_base.AffinityBase):
         )
         return self._send_request(
             method='get',
-            url=self.__url('field-values'),
-            params={
-                'person_id': entity_id if entity_type == 'person' and not list_entry_id else None,
-                'organization_id': entity_id if entity_type == 'company' and not list_entry_id else None,
-                'opportunity_id': entity_id if entity_type == 'opportunity' and not list_entry_id else None,
-                'list_entry_id': list_entry_id if list_entry_id else None
-            },
+            url=self.__url_field_values,
+            params=(
+                {'list_entry_id': list_entry_id}
+                if list_entry_id
+                else {_ENTITY_PARAM[entity_type]: entity_id}
+            ),
             result_type=list[affinity_types.FieldValue]
         )
 
@@ -133,7 +276,7 @@ class AffinityClientV1(affinity_base.AffinityBase):
         self.__logger.info(f'Creating field value - {field_id} - {entity_id} - {value}')
         return self._send_request(
             method='post',
-            url=self.__url('field-values'),
+            url=self.__url_field_values,
             json={
                 'field_id': field_id,
                 'entity_id': entity_id,
@@ -143,6 +286,36 @@ class AffinityClientV1(affinity_base.AffinityBase):
             result_type=affinity_types.FieldValue
         )
 
+    def bulk_create_field_values(self, new_values: list[dict]) -> list[affinity_types.FieldValue]:
+        """
+        Create a batch of field values. The v1 API has no native bulk endpoint, so this
+        issues one create per entry, fanned out over the shared executor - callers
+        should prefer it over looping themselves so batching strategy lives in one place.
+        Results come back in input order and the first failure is raised.
+        """
+        self.__logger.info(f'Creating {len(new_values)} field values')
+
+        if len(new_values) == 1:
+            return [self.create_field_value(**new_values[0])]
+
+        return list(self.__executor().map(
+            lambda new_value: self.create_field_value(**new_value),
+            new_values
+        ))
+
+    def bulk_delete_field_values(self, field_value_ids: list[int]) -> None:
+        """Delete a batch of field values - see bulk_create_field_values."""
+        self.__logger.info(f'Deleting {len(field_value_ids)} field values')
+
+        if len(field_value_ids) == 1:
+            self.delete_field_value(field_value_id=field_value_ids[0])
+            return
+
+        list(self.__executor().map(
+            lambda field_value_id: self.delete_field_value(field_value_id=field_value_id),
+            field_value_ids
+        ))
+
     def update_field_value(self, field_value_id: int, new_value: str) -> None:
         self.__logger.info(f'Updating field value - {field_value_id}')
         self._send_request(
@@ -176,10 +349,17 @@ class AffinityClientV1(affinity_base.AffinityBase):
         )
 
     def find_company_by_domain(self, domain: str, take_best_match: bool = False) -> affinity_types.Company | None:
+        domain = domain.strip().lower()
         self.__logger.debug(f'Finding company by domain - {domain}')
+        cache_key = ('company_by_domain', domain, take_best_match)
+        cached = self.__cache_get(cache_key)
+
+        if cached is not _CACHE_MISS:
+            return cached
+
         response = self._send_request(
             method='get',
-            url=self.__url('organizations'),
+            url=self.__url_organizations,
             result_type=affinity_types.CompanyQueryResponse,
             params={'term': domain}
         )
@@ -187,10 +367,11 @@ class AffinityClientV1(affinity_base.AffinityBase):
         valid_companies = [
             company
             for company in response.organizations
-            if any(company_domain.lower() == domain.lower() for company_domain in company.domains)
+            if domain in {company_domain.lower() for company_domain in company.domains}
         ]
 
         if len(valid_companies) == 1 or (take_best_match and len(valid_companies) > 0):
+            self.__cache_set(cache_key, valid_companies[0])
             return valid_companies[0]
 
         if len(valid_companies) > 1:
@@ -199,35 +380,43 @@ class AffinityClientV1(affinity_base.AffinityBase):
 
             raise affinity_types.MultipleResults(f'Multiple results found for {domain}')
 
+        self.__cache_set(cache_key, None)
+
         return None
 
     def find_company_by_domains(self, domains: list[str]) -> affinity_types.Company | None:
         self.__logger.info(f'Finding company by domains - {domains}')
 
-        for domain in domains:
-            company = self.find_company_by_domain(domain=domain)
-
-            if company:
-                return company
+        if len(domains) == 1:
+            return self.find_company_by_domain(domain=domains[0])
 
-        return None
+        return self.__first_concurrent_match(find=self.find_company_by_domain, values=domains)
 
     def find_company_by_name(self, name: str, take_best_match: bool = False) -> affinity_types.Company | None:
+        name = name.strip()
         self.__logger.info(f'Finding company by name - {name}')
+        cache_key = ('company_by_name', name.lower(), take_best_match)
+        cached = self.__cache_get(cache_key)
+
+        if cached is not _CACHE_MISS:
+            return cached
+
         response = self._send_request(
             method='get',
-            url=self.__url('organizations'),
+            url=self.__url_organizations,
             result_type=affinity_types.CompanyQueryResponse,
             params={'term': name}
         )
 
+        name_upper = name.upper()
         valid_companies = [
             company
             for company in response.organizations
-            if company.name.upper() == name.upper()
+            if company.name.upper() == name_upper
         ]
 
         if len(valid_companies) == 1 or (take_best_match and len(valid_companies) > 0):
+            self.__cache_set(cache_key, valid_companies[0])
             return valid_companies[0]
 
         if len(valid_companies) > 1:
@@ -236,22 +425,27 @@ class AffinityClientV1(affinity_base.AffinityBase):
 
             raise affinity_types.MultipleResults(f'Multiple results found for {name}')
 
+        self.__cache_set(cache_key, None)
+
         return None
 
     def create_company(self, new_company: affinity_types.NewCompany) -> affinity_types.Company:
         self.__logger.info(f'Creating company - {new_company.name}')
-        return self._send_request(
+        company = self._send_request(
             method='post',
-            url=self.__url('organizations'),
+            url=self.__url_organizations,
             result_type=affinity_types.Company,
-            json=new_company.model_dump()
+            json_model=new_company
         )
+        self.__refresh_company_cache(company)
+
+        return company
 
     def find_opportunity_by_name(self, list_id: int, name: str) -> affinity_types.Opportunity | None:
         self.__logger.debug(f'Finding opportunity by name - {name}')
         response = self._send_request(
             method='get',
-            url=self.__url('opportunities'),
+            url=self.__url_opportunities,
             result_type=affinity_types.OpportunityQueryResponse,
             params={'term': name}
         )
@@ -277,28 +471,35 @@ class AffinityClientV1(affinity_base.AffinityBase):
         self.__logger.info(f'Creating opportunity - {new_opportunity.name}')
         return self._send_request(
             method='post',
-            url=self.__url('opportunities'),
+            url=self.__url_opportunities,
             result_type=affinity_types.Opportunity,
-            json=new_opportunity.model_dump()
+            json_model=new_opportunity
         )
 
     def update_person(self, person_id: int, new_person: affinity_types.NewPerson) -> affinity_types.Person:
         self.__logger.info(f'Updating person - {person_id}')
-        return self._send_request(
+        new_person.emails = affinity_types.clean_emails(new_person.emails)
+        person = self._send_request(
             method='put',
             url=self.__url(f'persons/{person_id}'),
-            json=new_person.model_dump(),
+            json_model=new_person,
             result_type=affinity_types.Person
         )
+        self.__refresh_person_cache(person)
+
+        return person
 
     def update_company(self, company_id: int, new_company: affinity_types.NewCompany) -> affinity_types.Company:
         self.__logger.info(f'Updating company - {company_id}')
-        return self._send_request(
+        company = self._send_request(
             method='put',
             url=self.__url(f'organizations/{company_id}'),
-            json=new_company.model_dump(),
+            json_model=new_company,
             result_type=affinity_types.Company
         )
+        self.__refresh_company_cache(company)
+
+        return company
 
     def update_opportunity(
             self,
@@ -318,14 +519,18 @@ class AffinityClientV1(affinity_base.AffinityBase):
             result_type=affinity_types.Opportunity
         )
 
-    def fetch_all_list_entries(self, list_id: int) -> list[affinity_types.ListEntry]:
-        self.__logger.debug(f'Fetching list entries - {list_id}')
-        return self._send_request(
+    def iter_list_entries(self, list_id: int) -> Generator[affinity_types.ListEntry, None, None]:
+        self.__logger.debug(f'Streaming list entries - {list_id}')
+        yield from self._iter_request(
             method='get',
             url=self.__url(f'lists/{list_id}/list-entries'),
-            result_type=list[affinity_types.ListEntry]
+            item_type=affinity_types.ListEntry
         )
 
+    def fetch_all_list_entries(self, list_id: int) -> list[affinity_types.ListEntry]:
+        self.__logger.debug(f'Fetching list entries - {list_id}')
+        return list(self.iter_list_entries(list_id=list_id))
+
     def create_list_entry(
             self,
             list_id: int,
@@ -348,11 +553,7 @@ class AffinityClientV1(affinity_base.AffinityBase):
         return self._send_request(
             method='get',
             url=self.__url('entity-files'),
-            params={
-                'person_id': entity_id if entity_type == 'person' else None,
-                'organization_id': entity_id if entity_type == 'company' else None,
-                'opportunity_id': entity_id if entity_type == 'opportunity' else None
-            },
+            params={_ENTITY_PARAM[entity_type]: entity_id},
             result_type=affinity_types.EntityFilesResponse
         ).entity_files
 
@@ -368,11 +569,7 @@ class AffinityClientV1(affinity_base.AffinityBase):
         return self._send_request(
             method='post',
             url=self.__url('entity-files'),
-            params={
-                'person_id': entity_id if entity_type == 'person' else None,
-                'organization_id': entity_id if entity_type == 'company' else None,
-                'opportunity_id': entity_id if entity_type == 'opportunity' else None
-            },
+            params={_ENTITY_PARAM[entity_type]: entity_id},
             files=[
                 ('file', (file_name, file, file_type))
             ],
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from typing import Type
+
+import httpx
+import orjson
+
+from . import affinity_base
+from ..module_types import affinity_v1_api as affinity_types, base
+
+
+class AffinityClientV1Async:
+    """
+    Async sibling of AffinityClientV1 for the lookup-heavy endpoints. Runs over a single
+    HTTP/2 connection so a batch of lookups is multiplexed instead of serialised, making
+    wall time roughly one round trip rather than one per item.
+    """
+
+    __URL = 'https://api.affinity.co/'
+
+    def __init__(self, api_key: str, max_connections: int = 8):
+        self.__logger = logging.getLogger('affinity_sync.AffinityClientV1Async')
+        self.__client = httpx.AsyncClient(
+            http2=True,
+            auth=('username', api_key),
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=30
+        )
+        self.api_call_entitlement: object | None = None
+
+    async def __aenter__(self) -> 'AffinityClientV1Async':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.__client.aclose()
+
+    def __url(self, path: str) -> str:
+        return f'{self.__URL}{path}'
+
+    async def _send_request(
+            self,
+            method: str,
+            url: str,
+            result_type: Type[base.BaseSubclass],
+            params: dict | None = None
+    ) -> base.BaseSubclass:
+        self.__logger.debug(f'Sending {method.upper()} request to {url}')
+        response = await self.__client.request(method=method, url=url, params=params)
+        response.raise_for_status()
+        entitlement = affinity_base.parse_rate_limit(response.headers)
+
+        if entitlement is not None:
+            self.api_call_entitlement = entitlement
+
+        return result_type.model_validate(orjson.loads(response.content))
+
+    async def find_person_by_email(self, email: str) -> affinity_types.Person | None:
+        email = email.strip().lower()
+        self.__logger.debug(f'Finding person by email - {email}')
+        response = await self._send_request(
+            method='get',
+            url=self.__url('persons'),
+            result_type=affinity_types.PersonQueryResponse,
+            params={'term': email}
+        )
+
+        return response.persons[0] if response.persons else None
+
+    async def find_person_by_emails(self, emails: list[str]) -> affinity_types.Person | None:
+        self.__logger.debug(f'Finding person by emails - {emails}')
+        results = await asyncio.gather(*[
+            self.find_person_by_email(email=email)
+            for email in emails
+        ])
+
+        return next((person for person in results if person), None)
+
+    async def find_company_by_domain(self, domain: str) -> affinity_types.Company | None:
+        domain = domain.strip().lower()
+        self.__logger.debug(f'Finding company by domain - {domain}')
+        response = await self._send_request(
+            method='get',
+            url=self.__url('organizations'),
+            result_type=affinity_types.CompanyQueryResponse,
+            params={'term': domain}
+        )
+
+        valid_companies = [
+            company
+            for company in response.organizations
+            if domain in {company_domain.lower() for company_domain in company.domains}
+        ]
+
+        return valid_companies[0] if valid_companies else None
+
+    async def find_company_by_domains(self, domains: list[str]) -> affinity_types.Company | None:
+        self.__logger.debug(f'Finding company by domains - {domains}')
+        results = await asyncio.gather(*[
+            self.find_company_by_domain(domain=domain)
+            for domain in domains
+        ])
+
+        return next((company for company in results if company), None)
@@ -8,9 +8,9 @@ from ..module_types import affinity_v2_api as affinity_types, base
 class AffinityClientV2(affinity_base.AffinityBase):
     __URL = 'https://api.affinity.co/v2/'
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, pool_maxsize: int = 32):
         self.__logger = logging.getLogger('affinity_sync.AffinityClientV2')
-        super().__init__(api_key)
+        super().__init__(api_key, pool_maxsize=pool_maxsize)
 
     def __url(self, path: str) -> str:
         return f'{self.__URL}{path}'
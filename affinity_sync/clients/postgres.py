@@ -1,9 +1,14 @@
+import atexit
 import json
 import logging
+import os
+import queue
+import threading
 import typing
 from typing import Literal, Any, Type
 
 import psycopg
+import psycopg_pool
 from psycopg import sql
 from psycopg.rows import dict_row
 
@@ -43,7 +48,7 @@ TYPE_MAP = {
 
 
 class PostgresClient:
-    __connection = None
+    __MIN_POOL_SIZE = 2
 
     def __init__(
             self,
@@ -53,36 +58,33 @@ class PostgresClient:
             password: str,
             dbname: str
     ):
-        self.__host = host
-        self.__port = port
-        self.__user = user
-        self.__password = password
-        self.__dbname = dbname
+        self.__pool = psycopg_pool.ConnectionPool(
+            kwargs={
+                'host': host,
+                'port': port,
+                'user': user,
+                'password': password,
+                'dbname': dbname,
+                'autocommit': True,
+            },
+            min_size=self.__MIN_POOL_SIZE,
+            max_size=int(os.environ.get('AFFINITY_SYNC_DB_POOL_SIZE', 10)),
+            configure=self.__configure_connection,
+        )
 
         self.__logger = logging.getLogger('affinity_sync.PostgresClient')
         self.__assert_schema_exists()
 
-    def connection(self) -> psycopg.Connection:
-        if self.__connection is None or self.__connection.closed:
-            self.__connection = psycopg.connect(
-                host=self.__host,
-                port=self.__port,
-                user=self.__user,
-                password=self.__password,
-                dbname=self.__dbname,
-                autocommit=True,
-            )
-
-            with self.__connection.cursor() as cursor:
-                cursor.execute('SET TIMEZONE TO UTC')
-                cursor.execute('SET search_path TO affinity')
-
-        return self.__connection
+    @staticmethod
+    def __configure_connection(connection: psycopg.Connection) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('SET TIMEZONE TO UTC')
+            cursor.execute('SET search_path TO affinity')
 
-    def execute(self, query: sql.SQL | sql.Composed):
-        with self.connection().cursor() as cursor:
-            cursor.execute(query)
-            self.connection().commit()
+    def execute(self, query: sql.SQL | sql.Composed, params: tuple | None = None):
+        with self.__pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
 
     def fetch(
             self,
@@ -92,7 +94,7 @@ class PostgresClient:
         class Wrapper(base.Base):
             payload: result_type
 
-        with self.connection().cursor(row_factory=dict_row) as cursor:
+        with self.__pool.connection() as connection, connection.cursor(row_factory=dict_row) as cursor:
             cursor.execute(query)
             results = cursor.fetchall()
 
@@ -482,7 +484,14 @@ class PostgresClient:
         )
 
     def insert_call_entitlement(self, entitlement: affintiy_types.ApiCallEntitlement) -> None:
-        self.__logger.debug(f'Inserting call entitlement - {entitlement.org_remaining} remaining')
+        self.insert_call_entitlements(entitlements=[entitlement])
+
+    def insert_call_entitlements(self, entitlements: list[affintiy_types.ApiCallEntitlement]) -> None:
+
+        if not entitlements:
+            return
+
+        self.__logger.debug(f'Inserting {len(entitlements)} call entitlements')
         self.execute(
             sql.SQL(
                 '''
@@ -495,15 +504,22 @@ class PostgresClient:
                     org_reset
                 )
                 VALUES
-                    ({user_limit}, {user_remaining}, {user_reset}, {org_limit}, {org_remaining}, {org_reset})
+                    {values}
                 '''
             ).format(
-                user_limit=sql.Literal(entitlement.user_limit),
-                user_remaining=sql.Literal(entitlement.user_remaining),
-                user_reset=sql.Literal(entitlement.user_reset),
-                org_limit=sql.Literal(entitlement.org_limit),
-                org_remaining=sql.Literal(entitlement.org_remaining),
-                org_reset=sql.Literal(entitlement.org_reset)
+                values=sql.SQL(',').join(sql.SQL('(%s, %s, %s, %s, %s, %s)') for _ in entitlements)
+            ),
+            params=tuple(
+                value
+                for entitlement in entitlements
+                for value in (
+                    entitlement.user_limit,
+                    entitlement.user_remaining,
+                    entitlement.user_reset,
+                    entitlement.org_limit,
+                    entitlement.org_remaining,
+                    entitlement.org_reset,
+                )
             )
         )
 
@@ -575,3 +591,56 @@ class PostgresClient:
     def release_lock(self) -> None:
         self.__logger.info('Releasing sync lock')
         self.execute(sql.SQL('DELETE FROM affinity.sync_running'))
+
+
+class EntitlementBuffer:
+    """
+    Coalesces api_call_entitlement bookkeeping rows so a bulk sync does not issue one
+    INSERT per Affinity call. A daemon thread flushes the queue every couple of seconds
+    (sooner once a batch is full) as a single multi-row INSERT, and a final flush is
+    registered with atexit so no samples are lost on shutdown.
+    """
+    __FLUSH_ROWS = 500
+    __FLUSH_INTERVAL = 2.0
+
+    def __init__(self, client: PostgresClient):
+        self.__client = client
+        self.__queue = queue.Queue()
+        self.__batch_full = threading.Event()
+        self.__logger = logging.getLogger('affinity_sync.EntitlementBuffer')
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+        atexit.register(self.flush)
+
+    def put(self, entitlement: affintiy_types.ApiCallEntitlement | None) -> None:
+
+        if entitlement is None:
+            return
+
+        self.__queue.put(entitlement)
+
+        if self.__queue.qsize() >= self.__FLUSH_ROWS:
+            self.__batch_full.set()
+
+    def flush(self) -> None:
+        rows = []
+
+        while True:
+            try:
+                rows.append(self.__queue.get_nowait())
+
+            except queue.Empty:
+                break
+
+        self.__client.insert_call_entitlements(entitlements=rows)
+
+    def __run(self) -> None:
+        while True:
+            self.__batch_full.wait(timeout=self.__FLUSH_INTERVAL)
+            self.__batch_full.clear()
+
+            try:
+                self.flush()
+
+            except Exception as error:
+                self.__logger.error(f'Failed to flush call entitlements - {error}')
@@ -15,6 +15,10 @@ class MultipleResults(Exception):
     pass
 
 
+def clean_emails(emails: list[str]) -> list[str]:
+    return [email.strip() for email in emails if email.strip()]
+
+
 class NewPerson(base.Base):
     first_name: str = pydantic.Field(min_length=1)
     last_name: str = pydantic.Field(min_length=1)
@@ -23,7 +27,7 @@ class NewPerson(base.Base):
 
     @pydantic.field_validator('emails')
     def validate_emails(cls, emails):
-        return [email.strip() for email in emails if email.strip()]
+        return clean_emails(emails)
 
 
 class Person(base.Base):
@@ -65,6 +69,15 @@ class Field(base.Base):
     track_changes: bool
     dropdown_options: list[DropDownOption]
 
+    @classmethod
+    def from_trusted(cls, data: dict) -> 'Field':
+        return cls.model_construct(**data | {
+            'dropdown_options': [
+                DropDownOption.model_construct(**option)
+                for option in data.get('dropdown_options', [])
+            ]
+        })
+
 
 class FieldValue(base.Base, frozen=True):
     id: int
@@ -107,6 +120,10 @@ FieldTypeMap = {
     'dropdown-multi': list,
 }
 
+# isinstance-ready tuples per v2 value_type tag, so the per-field type check is a single
+# dict get plus one isinstance call.
+FIELD_TYPE_TUPLES = {key: (value,) for key, value in FieldTypeMap.items()}
+
 
 class Company(base.Base):
     id: int
@@ -118,6 +135,12 @@ class Company(base.Base):
     person_ids: list[int] = pydantic.Field(default_factory=list)
     list_entries: list = pydantic.Field(default_factory=list)
 
+    @classmethod
+    def from_trusted(cls, data: dict) -> 'Company':
+        data = dict(data)
+        data['global_'] = data.pop('global', False)
+        return cls.model_construct(**data)
+
 
 class CompanyQueryResponse(base.Base):
     organizations: list[Company]
@@ -146,6 +169,15 @@ class Opportunity(base.Base):
     organization_ids: list[int]
     list_entries: list[OpportunityListEntry]
 
+    @classmethod
+    def from_trusted(cls, data: dict) -> 'Opportunity':
+        return cls.model_construct(**data | {
+            'list_entries': [
+                OpportunityListEntry.model_construct(**entry)
+                for entry in data.get('list_entries', [])
+            ]
+        })
+
     @property
     def list_id(self) -> int:
         return self.list_entries[0].list_id
@@ -167,6 +199,13 @@ class NewOpportunity(base.Base):
     organization_ids: list[int] = pydantic.Field(default_factory=list)
 
 
+ENTITY_TYPE_DISPATCH = {
+    0: Person,
+    1: Company,
+    8: Opportunity,
+}
+
+
 class ListEntry(base.Base):
     id: int
     list_id: int
@@ -176,6 +215,15 @@ class ListEntry(base.Base):
     entity_type: int | None = None
     entity: Opportunity | Person | Company
 
+    @classmethod
+    def from_trusted(cls, data: dict) -> 'ListEntry':
+        entity_type = ENTITY_TYPE_DISPATCH.get(data.get('entity_type'))
+
+        if entity_type is None:
+            return cls.model_validate(data)
+
+        return cls.model_construct(**data | {'entity': entity_type.from_trusted(data['entity'])})
+
     @property
     def entity_type_name(self) -> Literal['person', 'company', 'opportunity']:
 
@@ -0,0 +1,55 @@
+import datetime
+
+try:
+    import msgspec
+
+except ImportError:
+    msgspec = None
+
+# msgspec.Struct mirrors of the largest flat v1 list responses. Decoding straight from
+# bytes into these skips both the dict intermediate and per-row model construction, so
+# they are used by AffinityBase for trusted list responses when msgspec is installed.
+# Attribute names match the pydantic models in affinity_v1_api so callers are unaffected.
+
+if msgspec is not None:
+
+    class DropDownOption(msgspec.Struct):
+        id: int
+        text: str
+        rank: int
+        color: int
+
+
+    class Field(msgspec.Struct):
+        id: int
+        name: str
+        list_id: int | None
+        enrichment_source: str
+        value_type: int
+        allows_multiple: bool
+        track_changes: bool
+        dropdown_options: list[DropDownOption]
+
+
+    class FieldValue(msgspec.Struct, frozen=True):
+        id: int
+        field_id: int
+        list_entry_id: int | None
+        entity_id: int
+        created_at: datetime.datetime
+        updated_at: datetime.datetime | None
+        value: int | float | str | dict | None
+        value_type: int
+        entity_type: int
+
+
+from . import affinity_v1_api
+
+if msgspec is not None:
+    STRUCT_MIRRORS = {
+        affinity_v1_api.Field: Field,
+        affinity_v1_api.FieldValue: FieldValue,
+    }
+
+else:
+    STRUCT_MIRRORS = {}
@@ -1,4 +1,5 @@
 import datetime
+import functools
 from typing import Any, Literal
 
 import pydantic
@@ -74,6 +75,16 @@ class FieldMetadata(base.Base):
         validation_alias=pydantic.AliasChoices('valueType', 'value_type')
     )
 
+    @functools.cached_property
+    def v1_id(self) -> int | str:
+        """The numeric v1 id behind custom ids like 'field-123'; other ids pass through."""
+        _, sep, tail = self.affinity_id.partition('-')
+
+        if sep and tail.isdigit():
+            return int(tail)
+
+        return self.affinity_id
+
 
 class ListFieldMetadata(FieldMetadata):
     list_affinity_id: int
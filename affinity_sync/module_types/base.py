@@ -8,5 +8,14 @@ class Base(pydantic.BaseModel):
         extra='forbid'
     )
 
+    @classmethod
+    def from_trusted(cls, data: dict) -> 'Base':
+        """
+        Build an instance without running validation - only safe for data from a trusted
+        source (i.e. the Affinity API itself). Subclasses with nested models or aliased
+        fields override this to construct those by hand.
+        """
+        return cls.model_construct(**data)
+
 
 BaseSubclass = TypeVar("BaseSubclass", bound=Base)
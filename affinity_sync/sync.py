@@ -44,6 +44,7 @@ class Sync:
             db_user=db_user,
             db_password=db_password
         )
+        self.__entitlement_buffer = clients.EntitlementBuffer(client=self.__postgres_client)
         self.__logger = logging.getLogger('affinity_sync.Sync')
 
     def __sync(
@@ -66,8 +67,7 @@ class Sync:
         )
 
     def insert_call_entitlement(self):
-        if self.__affinity_client.api_call_entitlement:
-            self.__postgres_client.insert_call_entitlement(entitlement=self.__affinity_client.api_call_entitlement)
+        self.__entitlement_buffer.put(self.__affinity_client.api_call_entitlement)
 
     @insert_entitlement_after
     def __sync_people(self) -> None:
@@ -1,6 +1,14 @@
+import collections
+import concurrent.futures
 import datetime
 import functools
+import hashlib
+import itertools
 import logging
+import pathlib
+import pickle
+import threading
+import time
 from typing import Literal, Any
 
 from affinity_sync.clients import affinity_base
@@ -19,6 +27,37 @@ class FieldNotFoundError(Exception):
 
 FieldType = affinity_types.Location | list[str] | float | str | None | datetime.datetime | list[int]
 
+_FIELD_CACHE_DIR = pathlib.Path('~/.cache/affinity-sync').expanduser()
+
+_SENTINEL = object()
+
+
+class cached_property:
+    """
+    Like functools.cached_property but without its per-access locking - these
+    properties sit in the hot field-lookup path. The computed values are idempotent
+    fetches, so a rare duplicate fetch under concurrent first access is acceptable.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+
+        if instance is None:
+            return self
+
+        value = instance.__dict__.get(self.name, _SENTINEL)
+
+        if value is _SENTINEL:
+            value = instance.__dict__[self.name] = self.func(instance)
+
+        return value
+
 
 def insert_entitlement_after(func):
     @functools.wraps(func)
@@ -32,6 +71,7 @@ def insert_entitlement_after(func):
 
 class Writer:
     __logger = logging.getLogger('affinity_sync.Writer')
+    __FIELD_CACHE_TTL = 3600
 
     def __init__(
             self,
@@ -41,6 +81,7 @@ class Writer:
             db_name: str,
             db_user: str,
             db_password: str,
+            refresh_fields: bool = False,
     ):
         self.__affinity_v1 = clients.AffinityClientV1(api_key=affinity_api_key)
         self.__affinity_v2 = clients.AffinityClientV2(api_key=affinity_api_key)
@@ -58,30 +99,103 @@ class Writer:
             user=db_user,
             password=db_password,
         )
+        self.__entitlement_buffer = clients.EntitlementBuffer(client=self.__postgres_client)
+        # Guards the mutable caches below so one Writer can be shared across worker
+        # threads. Fetches happen outside the lock - a rare duplicate fetch is cheaper
+        # than serializing every call.
+        self.__cache_lock = threading.Lock()
         self.__list_fields: dict[int, dict[str, tuple[affinity_types_v2.FieldMetadata, affinity_types.Field]]] = {}
+        self.__list_entries_cache: dict[int, list[affinity_types.ListEntry]] = {}
+        self.__merged_fields_cache: dict[
+            int | None, dict[str, tuple[affinity_types_v2.FieldMetadata, affinity_types.Field]]
+        ] = {}
+        self.__field_cache_path = _FIELD_CACHE_DIR / (
+            f'fields-{hashlib.sha256(affinity_api_key.encode()).hexdigest()}.pickle'
+        )
+
+        if not refresh_fields:
+            self.__load_field_cache()
 
     def insert_call_entitlement(self):
-        self.__postgres_client.insert_call_entitlement(entitlement=self.__affinity_v1.api_call_entitlement)
+        self.__entitlement_buffer.put(self.__affinity_v1.api_call_entitlement)
+
+    def close(self) -> None:
+        """Flush pending bookkeeping and release the Affinity connections."""
+        self.__entitlement_buffer.flush()
+        self.__affinity_v1.close()
+        self.__affinity_v2.close()
+
+    def __enter__(self) -> 'Writer':
+        return self
 
-    @functools.cached_property
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __load_field_cache(self) -> None:
+        """
+        Pre-populate the field cached-properties from disk so a fresh process skips the
+        three metadata round trips at startup. Field schemas change rarely, so a stale
+        or unreadable cache is simply ignored and refetched.
+        """
+        try:
+            if time.time() - self.__field_cache_path.stat().st_mtime > self.__FIELD_CACHE_TTL:
+                return
+
+            with open(self.__field_cache_path, 'rb') as file:
+                cached = pickle.load(file)
+
+            v1_fields = cached['v1_fields']
+            fields = cached['fields']
+
+        except (OSError, pickle.PickleError, EOFError, AttributeError, KeyError, TypeError):
+            return
+
+        self.__v1_fields = v1_fields
+        self.__fields = fields
+
+    def __save_field_cache(
+            self,
+            fields: dict[str, tuple[affinity_types_v2.FieldMetadata, affinity_types.Field]]
+    ) -> None:
+        try:
+            self.__field_cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(self.__field_cache_path, 'wb') as file:
+                pickle.dump({'v1_fields': self.__v1_fields, 'fields': fields}, file)
+
+        except OSError as error:
+            self.__logger.debug(f'Could not write field cache - {error}')
+
+    @cached_property
     def __v1_fields(self) -> list[affinity_types.Field]:
         return self.__affinity_v1.fetch_fields()
 
-    @functools.cached_property
+    @cached_property
+    def __v1_fields_by_id(self) -> dict[int, affinity_types.Field]:
+        return {field.id: field for field in self.__v1_fields}
+
+    @cached_property
     def __fields(self) -> dict[str, tuple[affinity_types_v2.FieldMetadata, affinity_types.Field]]:
-        self.__logger.info('Fetching person fields')
-        v1_fields = {field.id: field for field in self.__v1_fields}
+        self.__logger.info('Fetching person and company fields')
+        v1_fields = self.__v1_fields_by_id
+
+        # The two paginated pulls are independent - run them side by side.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            people_fields, company_fields = executor.map(
+                list,
+                (self.__affinity_v2.get_people_fields(), self.__affinity_v2.get_company_fields())
+            )
 
         out = {}
 
-        for field in list(self.__affinity_v2.get_people_fields()) + list(self.__affinity_v2.get_company_fields()):
+        for field in itertools.chain(people_fields, company_fields):
             is_custom = field.type in ['global', 'list']
             is_entriched = field.type == 'enriched'
 
             if not is_custom and not is_entriched:
                 continue
 
-            v1_id = int(field.affinity_id.split('-')[1]) if is_custom else field.affinity_id
+            v1_id = field.v1_id if is_custom else field.affinity_id
             v1_field = v1_fields.get(v1_id)
 
             if v1_field is None:
@@ -92,6 +206,8 @@ class Writer:
 
             out[field.name.upper()] = (field, v1_field)
 
+        self.__save_field_cache(fields=out)
+
         return out
 
     def get_list_fields(self, list_id: int) -> dict[str, tuple[affinity_types_v2.FieldMetadata, affinity_types.Field]]:
@@ -99,7 +215,7 @@ class Writer:
             return list_fields
 
         self.__logger.info(f'Fetching list fields - {list_id}')
-        v1_fields = {field.id: field for field in self.__v1_fields}
+        v1_fields = self.__v1_fields_by_id
 
         out = {}
 
@@ -108,12 +224,12 @@ class Writer:
             if field.type not in ['global', 'list'] or field.affinity_id in ['persons', 'companies']:
                 continue
 
-            v1_id = int(field.affinity_id.split('-')[1]) if '-' in field.affinity_id else field.affinity_id
-            v1_field = v1_fields.get(v1_id)
+            v1_field = v1_fields.get(field.v1_id)
 
             out[field.name.upper()] = (field, v1_field)
 
-        self.__list_fields[list_id] = out
+        with self.__cache_lock:
+            self.__list_fields[list_id] = out
 
         return out
 
@@ -122,10 +238,13 @@ class Writer:
             field_name: str,
             list_id: int | None = None
     ) -> tuple[affinity_types_v2.FieldMetadata, affinity_types.Field]:
-        fields = self.__fields
+        fields = self.__merged_fields_cache.get(list_id)
+
+        if fields is None:
+            fields = self.__fields | self.get_list_fields(list_id=list_id) if list_id else self.__fields
 
-        if list_id:
-            fields = fields | self.get_list_fields(list_id=list_id)
+            with self.__cache_lock:
+                self.__merged_fields_cache[list_id] = fields
 
         field = fields.get(field_name.upper())
 
@@ -136,12 +255,14 @@ class Writer:
 
     @staticmethod
     def __check_field_value_type(value: FieldType, value_type: affinity_types_v2.FieldValueTypes) -> None:
-        if not affinity_types.FieldTypeMap.get(value_type):
+        expected = affinity_types.FIELD_TYPE_TUPLES.get(value_type)
+
+        if expected is None:
             raise ValueError(f'Invalid field value type - {value_type}')
 
-        if not isinstance(value, affinity_types.FieldTypeMap[value_type]) and value is not None:
+        if value is not None and not isinstance(value, expected):
             raise ValueError(
-                f'Field value type mismatch - {value} must be of type {affinity_types.FieldTypeMap[value_type]}'
+                f'Field value type mismatch - {value} must be of type {expected[0]}'
             )
 
     @insert_entitlement_after
@@ -250,7 +371,25 @@ class Writer:
                 except affinity_base.TryAgainError:
                     self.__logger.info('Company must have been deleted')
 
-        if domain:
+        name_future = None
+
+        if domain and match_on_name:
+            # The two lookups are independent - fire the name query speculatively so a
+            # domain miss does not cost a second round trip. Domain still wins.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                domain_future = executor.submit(
+                    self.__affinity_v1.find_company_by_domain,
+                    domain=domain,
+                    take_best_match=take_best_match
+                )
+                name_future = executor.submit(
+                    self.__affinity_v1.find_company_by_name,
+                    name=name,
+                    take_best_match=take_best_match
+                )
+                company = domain_future.result()
+
+        elif domain:
             company = self.__affinity_v1.find_company_by_domain(domain=domain, take_best_match=take_best_match)
 
         if company:
@@ -258,7 +397,8 @@ class Writer:
             return company
 
         if match_on_name:
-            company = self.__affinity_v1.find_company_by_name(name=name, take_best_match=take_best_match)
+            company = name_future.result() if name_future else \
+                self.__affinity_v1.find_company_by_name(name=name, take_best_match=take_best_match)
 
             if company:
                 self.__logger.info(f'Company found by name - {name}')
@@ -299,6 +439,31 @@ class Writer:
             )
         )
 
+    def invalidate_list(self, list_id: int) -> None:
+        """Drop the cached entries for a list - call after mutating it outside this Writer."""
+        with self.__cache_lock:
+            self.__list_entries_cache.pop(list_id, None)
+
+    def __fetch_list_entries(self, list_id: int) -> list[affinity_types.ListEntry]:
+        if (entries := self.__list_entries_cache.get(list_id)) is not None:
+            return entries
+
+        entries = self.__affinity_v1.fetch_all_list_entries(list_id=list_id)
+
+        with self.__cache_lock:
+            self.__list_entries_cache[list_id] = entries
+
+        return entries
+
+    def __create_list_entry(self, entity_id: int, list_id: int) -> affinity_types.ListEntry:
+        entry = self.__affinity_v1.create_list_entry(entity_id=entity_id, list_id=list_id)
+
+        with self.__cache_lock:
+            if (cached := self.__list_entries_cache.get(list_id)) is not None:
+                cached.append(entry)
+
+        return entry
+
     @insert_entitlement_after
     def create_list_entry(
             self,
@@ -306,7 +471,7 @@ class Writer:
             list_id: int,
     ) -> affinity_types.ListEntry:
         self.__logger.info(f'Creating list entry - {entity_id} - {list_id}')
-        return self.__affinity_v1.create_list_entry(entity_id=entity_id, list_id=list_id)
+        return self.__create_list_entry(entity_id=entity_id, list_id=list_id)
 
     @insert_entitlement_after
     def find_list_entry(
@@ -317,35 +482,49 @@ class Writer:
             qualifiers: dict[str, str] | None = None
     ) -> affinity_types.ListEntry | None:
         self.__logger.info(f'Finding list entry - {entity_id} - {list_id}')
-        entries = self.__affinity_v1.fetch_all_list_entries(list_id=list_id)
+        entries = self.__fetch_list_entries(list_id=list_id)
         mathing_entries = [entry for entry in entries if entry.entity_id == entity_id]
 
         self.__logger.info(f'Found {len(mathing_entries)} entries for entity - {entity_id}')
 
         if mathing_entries and qualifiers:
+            # The fields behind each qualifier are the same for every entry - resolve them once.
+            qualifier_fields = {
+                field_name: self.__get_field(field_name=field_name, list_id=list_id)
+                for field_name in qualifiers
+            }
             still_matching_entries = []
 
             for entry in mathing_entries:
-                match = True
                 current_field_values = self.__affinity_v1.fetch_field_values(
                     entity_id=entity_id,
                     entity_type=entity_type,
                     list_entry_id=entry.id
                 )
+                values_by_field_id = collections.defaultdict(list)
+
+                for value in current_field_values:
+                    values_by_field_id[value.field_id].append(value.value)
+
+                match = True
 
                 for field_name, desired_field_value in qualifiers.items():
-                    field, v1_field = self.__get_field(field_name=field_name, list_id=list_id)
+                    field, v1_field = qualifier_fields[field_name]
                     desired_field_value = desired_field_value \
                         if isinstance(desired_field_value, list) else [desired_field_value]
-                    current_field_values = [
-                        value.value
-                        for value in current_field_values
-                        if value.field_id == v1_field.id
-                    ]
-                    missing_values = [value for value in desired_field_value if value not in current_field_values]
-                    extra_values = [value for value in current_field_values if value not in desired_field_value]
-
-                    if missing_values or extra_values:
+                    current_qualifier_values = values_by_field_id.get(v1_field.id, [])
+
+                    try:
+                        matches = set(desired_field_value) == set(current_qualifier_values)
+
+                    except TypeError:
+                        # Location values are not hashable - keep the list scan for those fields.
+                        matches = (
+                                all(value in current_qualifier_values for value in desired_field_value) and
+                                all(value in desired_field_value for value in current_qualifier_values)
+                        )
+
+                    if not matches:
                         match = False
                         break
 
@@ -380,7 +559,7 @@ class Writer:
         if current_entry:
             return current_entry
 
-        return self.__affinity_v1.create_list_entry(entity_id=entity_id, list_id=list_id)
+        return self.__create_list_entry(entity_id=entity_id, list_id=list_id)
 
     @insert_entitlement_after
     def update_person(self, person_id: int, new_person: affinity_types.NewPerson) -> affinity_types.Person:
@@ -431,7 +610,7 @@ class Writer:
 
         return out
 
-    def __update_field(
+    def __plan_field_update(
             self,
             entity_id: int,
             list_entry_id: int | None,
@@ -439,12 +618,15 @@ class Writer:
             field_value: FieldType,
             current_values: list[affinity_types.FieldValue],
             overwrite: bool,
-            list_id: int | None,
+            v1_field: affinity_types.Field,
             status_field: affinity_types.Field | None = None
-    ) -> None:
-        self.__logger.debug(f'Updating field - {field_name} - {field_value}')
-        field, v1_field = self.__get_field(field_name=field_name, list_id=list_id)
-        self.__check_field_value_type(value=field_value, value_type=field.value_type)
+    ) -> tuple[list[dict], set[int]]:
+        """
+        Work out the (creates, deletes) needed to bring one field to the desired value.
+        The field is resolved and type-checked by update_fields before this runs, and
+        no I/O happens here - update_fields accumulates the plans and ships them in bulk.
+        """
+        self.__logger.debug(f'Planning field update - {field_name} - {field_value}')
 
         if field_name.upper() == 'STATUS' and status_field:
             self.__logger.info(f'Updating status field - {field_value}')
@@ -461,7 +643,7 @@ class Writer:
 
         if current_values and not overwrite:
             self.__logger.info('Field already exists - will not overwrite')
-            return
+            return [], set()
 
         if not v1_field.allows_multiple and isinstance(field_value, list):
             raise ValueError(f'Field does not allow multiple values - {field_name}')
@@ -477,28 +659,34 @@ class Writer:
             current_raw_values = [value.value.split('.')[0] for value in current_values]
             field_value = [value.replace(tzinfo=None).strftime('%Y-%m-%dT%H:%M:%S') for value in field_value]
 
+        try:
+            desired_lookup = set(field_value)
+            current_lookup = set(current_raw_values)
+
+        except TypeError:
+            # Location values are not hashable - keep the list scan for those fields.
+            desired_lookup = field_value
+            current_lookup = current_raw_values
+
         values_to_remove = {
             value.id for value in current_values
-            if (value.value.split('.')[0] if is_date_field else value.value) not in field_value
+            if (value.value.split('.')[0] if is_date_field else value.value) not in desired_lookup
         }
-        values_to_add = [value for value in field_value if value not in current_raw_values]
+        values_to_add = [
+            {
+                'field_id': v1_field.id,
+                'entity_id': entity_id,
+                'value': value.model_dump() if isinstance(value, affinity_types.Location) else value,
+                'list_entry_id': list_entry_id if v1_field.list_id else None
+            }
+            for value in field_value
+            if value not in current_lookup
+        ]
 
         if not values_to_remove and not values_to_add:
             self.__logger.info('No changes required')
-            return
 
-        for value_id in values_to_remove:
-            self.__logger.info(f'Removing field value - {value_id}')
-            self.__affinity_v1.delete_field_value(field_value_id=value_id)
-
-        for value in values_to_add:
-            self.__logger.info(f'Adding field value - {value}')
-            self.__affinity_v1.create_field_value(
-                field_id=v1_field.id,
-                entity_id=entity_id,
-                value=value.model_dump() if isinstance(value, affinity_types.Location) else value,
-                list_entry_id=list_entry_id if v1_field.list_id else None
-            )
+        return values_to_add, values_to_remove
 
     @insert_entitlement_after
     def update_fields(
@@ -508,8 +696,14 @@ class Writer:
             fields: dict[str, FieldType],
             list_entry_id: int | None = None,
             list_id: int | None = None,
-            overwrite: bool = True
+            overwrite: bool = True,
+            current_values: list[affinity_types.FieldValue] | None = None
     ) -> None:
+        """
+        Bring the given fields to the desired values. Callers that already hold the
+        entity's field values (e.g. from a prior bulk export) can pass them as
+        current_values to skip the fetch round trip.
+        """
         self.__logger.info(f'Updating fields - {len(fields)}')
 
         if entity_type == 'opportunity' and list_entry_id is None:
@@ -522,46 +716,71 @@ class Writer:
             raise ValueError('list_entry_id is required when list_id is provided')
 
         self.__logger.info(f'Updating fields - {len(fields)}')
+        fields = {field_name.upper(): field_value for field_name, field_value in fields.items()}
 
-        current_values = self.__affinity_v1.fetch_field_values(
-            entity_id=entity_id,
-            entity_type=entity_type,
-        )
+        # Resolve and type-check every field before any write leaves the building, so a
+        # bad name or value cannot leave the entity half-updated.
+        resolved_fields = {
+            field_name: self.__get_field(field_name=field_name, list_id=list_id)
+            for field_name in fields
+        }
 
-        if list_entry_id:
-            current_values += self.__affinity_v1.fetch_field_values(
+        for field_name, field_value in fields.items():
+            field, _ = resolved_fields[field_name]
+            self.__check_field_value_type(value=field_value, value_type=field.value_type)
+
+        if current_values is None:
+            current_values = self.__affinity_v1.fetch_field_values(
                 entity_id=entity_id,
                 entity_type=entity_type,
-                list_entry_id=list_entry_id
             )
 
+            if list_entry_id:
+                current_values += self.__affinity_v1.fetch_field_values(
+                    entity_id=entity_id,
+                    entity_type=entity_type,
+                    list_entry_id=list_entry_id
+                )
+
         status_field = None
 
-        if any(field_name.upper() == 'STATUS' for field_name in fields.keys()):
+        if 'STATUS' in fields:
             options = self.__affinity_v1.fetch_fields()
             status_field = next((
                 field for field in options
                 if field.name.upper() == 'STATUS' and list_id == field.list_id
             ), None)
 
+        values_to_add: list[dict] = []
+        values_to_remove: set[int] = set()
+
         for field_name, field_value in fields.items():
-            self.__update_field(
+            _, v1_field = resolved_fields[field_name]
+            adds, removes = self.__plan_field_update(
                 entity_id=entity_id,
                 field_name=field_name,
                 field_value=field_value,
                 current_values=current_values,
                 list_entry_id=list_entry_id,
-                list_id=list_id,
                 overwrite=overwrite,
+                v1_field=v1_field,
                 status_field=status_field
             )
+            values_to_add.extend(adds)
+            values_to_remove.update(removes)
+
+        if values_to_remove:
+            self.__affinity_v1.bulk_delete_field_values(field_value_ids=sorted(values_to_remove))
+
+        if values_to_add:
+            self.__affinity_v1.bulk_create_field_values(new_values=values_to_add)
 
     @insert_entitlement_after
     def add_file_to_company_if_not_exists(self, company_id: int, file_name: str, file: bytes, file_type: str) -> None:
         self.__logger.info(f'Adding file to company - {company_id} - {file_name}')
         existing_files = self.__affinity_v1.fetch_all_entity_files(entity_id=company_id, entity_type='company')
 
-        if file_name in [file.name for file in existing_files]:
+        if file_name in {file.name for file in existing_files}:
             self.__logger.info('File already exists - will not add again')
             return
 